@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def group_start_per_row(group_ids: np.ndarray) -> np.ndarray:
+    """
+    For rows sorted by group key, return each row's group-start offset.
+
+    The offsets let every windowed statistic clamp its window to the row's
+    own group without any per-group dispatch.
+    """
+    n = len(group_ids)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    boundary = np.empty(n, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = group_ids[1:] != group_ids[:-1]
+    starts = np.flatnonzero(boundary)
+    sizes = np.diff(np.append(starts, n))
+    return np.repeat(starts, sizes)
+
+
+def grouped_ewma(
+    values: np.ndarray,
+    group_starts: np.ndarray,
+    alpha_fast: float,
+    alpha_slow: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Both adjust=False EWMAs (fast and slow span) in one sweep.
+
+    The recurrence y_t = a*x_t + (1-a)*y_{t-1} is sequential in time but
+    independent across groups, so the loop steps over within-group
+    positions and updates every group's state with vectorized ops — for a
+    panel of many universes over D days that is D small array ops instead
+    of a Python/Cython pass per group per span. NaN handling matches
+    pandas ewm(adjust=False, ignore_na=False): gaps decay the history
+    weight by (1-a)^gap before the next valid observation folds in.
+    """
+    n = len(values)
+    out_fast = np.full(n, np.nan)
+    out_slow = np.full(n, np.nan)
+    if n == 0:
+        return out_fast, out_slow
+
+    starts = np.unique(group_starts)
+    sizes = np.diff(np.append(starts, n))
+    n_groups = len(starts)
+
+    lanes = (
+        (alpha_fast, np.zeros(n_groups), out_fast),
+        (alpha_slow, np.zeros(n_groups), out_slow),
+    )
+    has = np.zeros(n_groups, dtype=bool)
+    # Exponent on (1-a) at the next valid observation: 1 after a valid row,
+    # incremented across NaN rows.
+    gap = np.ones(n_groups)
+
+    for t in range(int(sizes.max())):
+        active = np.flatnonzero(sizes > t)
+        rows = starts[active] + t
+        x = values[rows]
+        valid = ~np.isnan(x)
+
+        first = valid & ~has[active]
+        upd = valid & has[active]
+
+        for alpha, y, out in lanes:
+            if upd.any():
+                g = active[upd]
+                # adjust=False renormalizes the history weight back to 1
+                # after every valid observation, so the only state carried
+                # besides y is the NaN-gap decay exponent.
+                w2 = (1.0 - alpha) ** gap[g]
+                y[g] = (w2 * y[g] + alpha * x[upd]) / (w2 + alpha)
+            if first.any():
+                y[active[first]] = x[first]
+            # Emit current state; rows before a group's first valid
+            # observation keep their NaN.
+            emit = has[active] | first
+            out[rows[emit]] = y[active[emit]]
+
+        has[active[first]] = True
+        gap[active] = np.where(valid, 1.0, gap[active] + 1.0)
+
+    return out_fast, out_slow
+
+
+def cumulative_sums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Prefix sums of values, squared values and valid-observation counts
+    (NaN treated as zero-contribution), each with a leading zero so any
+    half-open window reduces to two lookups. Compute once per column and
+    share across every window size that reads it.
+    """
+    notna = ~np.isnan(values)
+    v0 = np.where(notna, values, 0.0)
+    cum_v = np.concatenate([[0.0], np.cumsum(v0)])
+    cum_sq = np.concatenate([[0.0], np.cumsum(v0 * v0)])
+    cum_n = np.concatenate([[0], np.cumsum(notna)])
+    return cum_v, cum_sq, cum_n
+
+
+def window_bounds(n: int, group_starts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Start offset of each row's trailing window, clamped at the row's group
+    start. Depends only on the layout and window size, so it is shared by
+    every column rolled at that window.
+    """
+    return np.maximum(np.arange(n) - window + 1, group_starts)
+
+
+def rolling_count(
+    cums: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    lo: np.ndarray,
+) -> np.ndarray:
+    """
+    Valid-observation count per trailing window, straight from the shared
+    prefix sums — for callers (coverage) that only need the count and
+    shouldn't pay for the mean/std legs of rolling_stats. Equivalent to
+    rolling(...).count() with min_periods=1, which can never be NaN since
+    every window contains at least its own row.
+    """
+    cum_n = cums[2]
+    idx = np.arange(len(lo))
+    return (cum_n[idx + 1] - cum_n[lo]).astype(np.float64)
+
+
+def rolling_stats(
+    values: np.ndarray,
+    group_starts: np.ndarray,
+    window: int,
+    min_periods: int,
+    cums: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    lo: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fused grouped rolling (mean, count, std) in one pass.
+
+    Matches pandas groupby(...).rolling(window, min_periods) semantics:
+    NaN values don't contribute, results are NaN where the window holds
+    fewer than min_periods observations, and std uses ddof=1 (NaN below
+    two observations). All three statistics come from a single cumulative
+    sum / sum-of-squares / count sweep instead of one rolling pass each.
+
+    Pass precomputed cumulative_sums(values) as `cums` and/or
+    window_bounds(...) as `lo` when rolling the same column at several
+    windows (or several columns at one window) to share that work.
+    """
+    n = len(values)
+    idx = np.arange(n)
+    if lo is None:
+        lo = window_bounds(n, group_starts, window)
+    if cums is None:
+        cums = cumulative_sums(values)
+    cum_v, cum_sq, cum_n = cums
+
+    cnt = (cum_n[idx + 1] - cum_n[lo]).astype(np.float64)
+    s = cum_v[idx + 1] - cum_v[lo]
+    sq = cum_sq[idx + 1] - cum_sq[lo]
+
+    has_any = cnt > 0
+    mean = np.divide(s, cnt, out=np.full(n, np.nan), where=has_any)
+    mean[cnt < min_periods] = np.nan
+
+    # rolling.count checks min_periods against rows present in the window
+    # (NaN included), unlike mean/std which compare valid observations.
+    rows_in_win = idx + 1 - lo
+    count = np.where(rows_in_win >= min_periods, cnt, np.nan)
+
+    # Sample variance via sum-of-squares; clip tiny negative residue from
+    # floating-point cancellation before the sqrt.
+    has_two = cnt >= 2
+    var = np.divide(
+        sq - np.divide(s * s, cnt, out=np.zeros(n), where=has_any),
+        cnt - 1.0,
+        out=np.full(n, np.nan),
+        where=has_two,
+    )
+    std = np.sqrt(np.clip(var, 0.0, None))
+    std[cnt < max(min_periods, 2)] = np.nan
+
+    return mean, count, std
@@ -1,33 +1,30 @@
 from __future__ import annotations
 
-import math
+import itertools
 from typing import Any, List, cast
 
+import numpy as np
 import pandas as pd
 
 from .parameters import EDRParams
 
 
-def _safe_div(a: pd.Series, b: pd.Series) -> pd.Series:
-    b2 = b.replace({0: pd.NA})
-    return (a / b2).fillna(0.0)
-
-
 def _extract_prices(x: Any) -> List[float]:
-    if not x or not isinstance(x, list):
+    # Arrow-loaded frames surface list columns as ndarray cells.
+    if not isinstance(x, (list, np.ndarray)) or len(x) == 0:
         return []
-    out: List[float] = []
-    for it in x:
-        if isinstance(it, dict) and it.get("price") is not None:
-            try:
-                out.append(float(it["price"]))
-            except Exception:
-                pass
-    return out
+    # Single comprehension over the known schema; the numeric check replaces
+    # the old per-element try/except (exception frames cost even when they
+    # never raise).
+    return [
+        float(p)
+        for it in x
+        if isinstance(it, dict) and isinstance(p := it.get("price"), (int, float))
+    ]
 
 
 def add_ccu(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    """Mutates df in place (compute_edr_daily owns the single copy)."""
     if "avg_ccu" in df.columns:
         df["avg_ccu"] = df["avg_ccu"].fillna(0).astype(float)
         return df
@@ -40,8 +37,7 @@ def add_ccu(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def add_monetization_features(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
+    """Mutates df in place (compute_edr_daily owns the single copy)."""
     # Monetization count
     if "monetization_count" not in df.columns:
         if "num_gamepasses" in df.columns or "num_devproducts" in df.columns:
@@ -51,49 +47,64 @@ def add_monetization_features(df: pd.DataFrame) -> pd.DataFrame:
         else:
             gp = cast(pd.Series, df["game_passes"] if "game_passes" in df.columns else pd.Series([None] * len(df)))
             dp = cast(pd.Series, df["dev_products"] if "dev_products" in df.columns else pd.Series([None] * len(df)))
-            df["monetization_count"] = gp.apply(lambda v: len(v) if isinstance(v, list) else 0) + dp.apply(
-                lambda v: len(v) if isinstance(v, list) else 0
+            df["monetization_count"] = gp.apply(lambda v: len(v) if isinstance(v, (list, np.ndarray)) else 0) + dp.apply(
+                lambda v: len(v) if isinstance(v, (list, np.ndarray)) else 0
             )
 
-    # Price surface
-    gp_prices = cast(pd.Series, (df["game_passes"] if "game_passes" in df.columns else pd.Series([None] * len(df))).apply(_extract_prices))
-    dp_prices = cast(pd.Series, (df["dev_products"] if "dev_products" in df.columns else pd.Series([None] * len(df))).apply(_extract_prices))
-    all_prices = gp_prices + dp_prices
-
-    def median(prices: List[float]) -> float:
-        if not prices:
-            return 0.0
-        s = sorted(prices)
-        mid = len(s) // 2
-        return float(s[mid]) if len(s) % 2 == 1 else float((s[mid - 1] + s[mid]) / 2)
-
-    def dispersion(prices: List[float]) -> float:
-        if not prices:
-            return 0.0
-        m = sum(prices) / len(prices)
-        if m <= 0:
-            return 0.0
-        var = sum((p - m) ** 2 for p in prices) / len(prices)
-        return float(math.sqrt(var) / m)
-
-    df["median_price"] = all_prices.apply(median)
-    df["price_dispersion"] = all_prices.apply(dispersion)
+    # Price surface: flatten every game's prices into one long (row, price)
+    # frame and reduce per row with a single vectorized groupby pass.
+    gp_col = df["game_passes"] if "game_passes" in df.columns else pd.Series([None] * len(df))
+    dp_col = df["dev_products"] if "dev_products" in df.columns else pd.Series([None] * len(df))
+
+    prices_list = [_extract_prices(gp) + _extract_prices(dp) for gp, dp in zip(gp_col, dp_col)]
+
+    n = len(df)
+    lens = np.fromiter(map(len, prices_list), dtype=np.int64, count=n)
+    total = int(lens.sum())
+
+    median_price = np.zeros(n, dtype=np.float64)
+    dispersion = np.zeros(n, dtype=np.float64)
+
+    if total > 0:
+        flat = np.fromiter(itertools.chain.from_iterable(prices_list), dtype=np.float64, count=total)
+        row = np.repeat(np.arange(n), lens)
+
+        g = pd.DataFrame({"r": row, "p": flat}).groupby("r", sort=False)["p"]
+        agg = g.agg(["median", "mean", "std"])
+
+        median_price[agg.index] = agg["median"].to_numpy()
+
+        mean = agg["mean"].to_numpy()
+        # Population std (ddof=0) over mean, zero where mean is not positive.
+        counts = lens[agg.index].astype(np.float64)
+        std0 = agg["std"].fillna(0.0).to_numpy() * np.sqrt(np.maximum(counts - 1.0, 0.0) / counts)
+        disp = np.where(mean > 0, std0 / np.where(mean > 0, mean, 1.0), 0.0)
+        dispersion[agg.index] = disp
+
+    df["median_price"] = median_price
+    df["price_dispersion"] = dispersion
 
     return df
 
 
-def add_engagement_score(df: pd.DataFrame, params: EDRParams) -> pd.DataFrame:
-    df = df.copy()
+def _column_f64(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col in df.columns:
+        return df[col].fillna(0).to_numpy(dtype=np.float64)
+    return np.zeros(len(df), dtype=np.float64)
+
 
-    visits = cast(pd.Series, df["visits"].fillna(0).astype(float) if "visits" in df.columns else pd.Series([0.0] * len(df), dtype=float))
-    favorites = cast(pd.Series, df["favorites"].fillna(0).astype(float) if "favorites" in df.columns else pd.Series([0.0] * len(df), dtype=float))
-    likes = cast(pd.Series, df["likes"].fillna(0).astype(float) if "likes" in df.columns else pd.Series([0.0] * len(df), dtype=float))
+def add_engagement_score(df: pd.DataFrame, params: EDRParams) -> pd.DataFrame:
+    """Mutates df in place (compute_edr_daily owns the single copy)."""
+    visits = _column_f64(df, "visits")
+    favorites = _column_f64(df, "favorites")
+    likes = _column_f64(df, "likes")
 
-    fav_rate = _safe_div(favorites, visits)
-    like_rate = _safe_div(likes, visits)
+    nonzero = visits != 0.0
+    fav_rate = np.divide(favorites, visits, out=np.zeros_like(favorites), where=nonzero)
+    like_rate = np.divide(likes, visits, out=np.zeros_like(likes), where=nonzero)
 
-    raw = cast(pd.Series, 0.5 * (fav_rate + like_rate))
-    df["engagement_score"] = (raw * params.engagement_scale).clip(0.0, params.engagement_cap)
+    raw = 0.5 * (fav_rate + like_rate)
+    df["engagement_score"] = np.clip(raw * params.engagement_scale, 0.0, params.engagement_cap)
     return df
 
 
@@ -102,24 +113,35 @@ def compute_edr_daily(df: pd.DataFrame, params: EDRParams) -> pd.DataFrame:
     Computes daily EDR on a snapshot (one date).
     Output includes:
       dau_est, pcr, aspu, spend_revenue, premium_revenue, edr_raw
+
+    One defensive copy up front; the add_* helpers mutate that copy in
+    place and the derived columns are computed as NumPy arrays, then
+    attached in a single batched assign.
     """
     out = df.copy()
     out = add_ccu(out)
     out = add_monetization_features(out)
     out = add_engagement_score(out, params)
 
-    out["dau_est"] = (params.alpha * out["avg_ccu"]).clip(lower=0.0)
+    dau_est = np.maximum(params.alpha * out["avg_ccu"].to_numpy(dtype=np.float64), 0.0)
 
     # PCR v1
-    out["pcr"] = (
-        params.base_rate * (1.0 + out["monetization_count"]).apply(lambda x: math.log(x))
-    ).clip(lower=params.pcr_floor, upper=params.pcr_cap)
+    pcr_arr = params.base_rate * np.log1p(out["monetization_count"].to_numpy(dtype=np.float64))
+    pcr = np.clip(pcr_arr, params.pcr_floor, params.pcr_cap)
 
     # ASPU v1
-    out["aspu"] = (out["median_price"] * (1.0 + out["price_dispersion"])).clip(lower=0.0)
-
-    out["spend_revenue"] = out["dau_est"] * out["pcr"] * out["aspu"]
-    out["premium_revenue"] = params.gamma * out["dau_est"] * out["engagement_score"]
-    out["edr_raw"] = (out["spend_revenue"] + out["premium_revenue"]).clip(lower=0.0)
-
-    return out
\ No newline at end of file
+    median_price = out["median_price"].to_numpy(dtype=np.float64)
+    dispersion = out["price_dispersion"].to_numpy(dtype=np.float64)
+    aspu = np.maximum(median_price * (1.0 + dispersion), 0.0)
+
+    spend_revenue = dau_est * pcr * aspu
+    premium_revenue = params.gamma * dau_est * out["engagement_score"].to_numpy(dtype=np.float64)
+
+    return out.assign(
+        dau_est=dau_est,
+        pcr=pcr,
+        aspu=aspu,
+        spend_revenue=spend_revenue,
+        premium_revenue=premium_revenue,
+        edr_raw=np.maximum(spend_revenue + premium_revenue, 0.0),
+    )
\ No newline at end of file
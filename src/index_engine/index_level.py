@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import List, Optional, cast
-import math
 
+import numpy as np
 import pandas as pd
 
+from .io_runs import write_csv, write_records_json
+
 
 def _as_df(obj: object) -> pd.DataFrame:
     if isinstance(obj, pd.DataFrame):
@@ -20,7 +22,8 @@ def _series_float(df: pd.DataFrame, col: str, default: float = 0.0) -> pd.Series
         raw = pd.to_numeric(df[col], errors="coerce")
         s = pd.Series(raw, index=df.index, dtype="float64").fillna(default)
         return cast(pd.Series, s)
-    return pd.Series([default] * len(df), index=df.index, dtype="float64")
+    # np.full avoids boxing a length-N Python list just to build the default.
+    return pd.Series(np.full(len(df), default, dtype=np.float64), index=df.index, copy=False)
 
 
 def _series_dt(df: pd.DataFrame, col: str) -> pd.Series:
@@ -36,7 +39,9 @@ def _series_dt(df: pd.DataFrame, col: str) -> pd.Series:
 
 
 def _filter_df(df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
-    out = df.loc[mask].copy()
+    # No eager copy: under Copy-on-Write (enabled at pipeline entry, default
+    # in pandas >=3) the slice only materializes if someone mutates it.
+    out = df.loc[mask]
     return cast(pd.DataFrame, out)
 
 
@@ -92,47 +97,45 @@ def build_index_level_series(
     # --- Build per-game previous-day EDR to compute returns ---
     snaps = snaps.loc[:, ["snapshot_date", "universeId", "edr_raw"]].copy()
     snaps = snaps.sort_values(by=["universeId", "snapshot_date"], kind="stable")
-    snaps["edr_prev"] = snaps.groupby("universeId")["edr_raw"].shift(1)
+
+    # Sorted by universeId, so the lag is just a shifted view with NaN at
+    # each group boundary — no groupby hashing required.
+    uid = snaps["universeId"].to_numpy()
+    edr_vals = snaps["edr_raw"].to_numpy(dtype=np.float64)
+    prev = np.empty_like(edr_vals)
+    if len(prev) > 0:
+        prev[0] = np.nan
+        prev[1:] = edr_vals[:-1]
+        prev[1:][uid[1:] != uid[:-1]] = np.nan
+    snaps["edr_prev"] = prev
 
     # Log return with eps stabilizer; first observation gets 0 log return
-    prev_s = pd.Series(snaps["edr_prev"], index=snaps.index).fillna(snaps["edr_raw"])
-    edr_s = pd.Series(snaps["edr_raw"], index=snaps.index)
+    edr_arr = snaps["edr_raw"].to_numpy(dtype=np.float64)
+    prev_arr = snaps["edr_prev"].to_numpy(dtype=np.float64)
 
     eps_f = float(eps)
-    log_rets: List[float] = []
-
-    # Pure-Python loop avoids numpy/pandas-stub typing issues in strict mode
-    for edr_v, prev_v in zip(edr_s.tolist(), prev_s.tolist()):
-        a = float(edr_v) + eps_f
-        b = float(prev_v) + eps_f
-        if b <= 0.0 or a <= 0.0:
-            log_rets.append(0.0)
-        else:
-            log_rets.append(math.log(a / b))
+    a = edr_arr + eps_f
+    b = np.where(np.isnan(prev_arr), edr_arr, prev_arr) + eps_f
+    valid = (a > 0.0) & (b > 0.0)
+    log_rets = np.zeros(len(snaps), dtype=np.float64)
+    np.log(a / b, out=log_rets, where=valid)
 
     snaps["log_ret"] = pd.Series(log_rets, index=snaps.index, dtype="float64")
 
     # --- Map each snapshot_date -> effective rebalance_date (most recent <= date) ---
-    # Create sorted unique rebalance dates
-    rebal_dates = sorted(set(cast(pd.Series, mem["rebalance_date"]).dropna().tolist()))
+    # np.unique on the datetime64 arrays sorts and dedups in one C call;
+    # searchsorted then assigns every snapshot date its effective rebalance
+    # date in a single vectorized binary search.
+    rebal_dates = np.unique(mem["rebalance_date"].to_numpy(dtype="datetime64[ns]"))
     if len(rebal_dates) == 0:
         raise ValueError("No rebalance dates found after normalization")
 
-    # Unique snapshot dates
-    snap_dates = sorted(set(cast(pd.Series, snaps["snapshot_date"]).dropna().tolist()))
+    snap_dates = np.unique(snaps["snapshot_date"].to_numpy(dtype="datetime64[ns]"))
     if len(snap_dates) == 0:
         raise ValueError("No snapshot dates found after normalization")
 
-    # Build mapping table date -> effective rebalance_date
-    # (simple linear scan; fast enough for daily data)
-    eff_reb: List[pd.Timestamp] = []
-    j = 0
-    current = rebal_dates[0]
-    for d in snap_dates:
-        while j + 1 < len(rebal_dates) and rebal_dates[j + 1] <= d:
-            j += 1
-            current = rebal_dates[j]
-        eff_reb.append(current)
+    idx = np.clip(np.searchsorted(rebal_dates, snap_dates, side="right") - 1, 0, len(rebal_dates) - 1)
+    eff_reb = rebal_dates[idx]
 
     map_df = pd.DataFrame({"snapshot_date": snap_dates, "rebalance_date": eff_reb})
     snaps = snaps.merge(map_df, on="snapshot_date", how="left")
@@ -141,35 +144,34 @@ def build_index_level_series(
     weights = mem.loc[:, ["rebalance_date", "universeId", "weight"]].copy()
     snaps = snaps.merge(weights, on=["rebalance_date", "universeId"], how="inner")
 
-    # Coverage sanity: sum of weights available that day
-    # Weighted log return per row
-    snaps["w_log_ret"] = snaps["weight"] * snaps["log_ret"]
-
-    daily_log = snaps.groupby("snapshot_date")["w_log_ret"].sum()
-    daily_cov = snaps.groupby("snapshot_date")["weight"].sum()
-
-    daily = pd.DataFrame(
-        {
-            "date": daily_log.index,
-            "daily_log_return": daily_log.values,
-            "coverage": daily_cov.reindex(daily_log.index).values,
-        }
-    ).sort_values(by=["date"], kind="stable")
+    # Coverage sanity: sum of weights available that day.
+    # One stable sort by date, then both daily sums fall out of a single
+    # np.add.reduceat reduction scan per column — no hash-groupby.
+    snaps = snaps.sort_values(by=["snapshot_date"], kind="stable")
+
+    dates = snaps["snapshot_date"].to_numpy()
+    weight_arr = snaps["weight"].to_numpy(dtype=np.float64)
+    w_log_ret = weight_arr * snaps["log_ret"].to_numpy(dtype=np.float64)
+
+    if len(snaps) > 0:
+        starts = np.concatenate([[0], np.flatnonzero(dates[1:] != dates[:-1]) + 1])
+        daily = pd.DataFrame(
+            {
+                "date": dates[starts],
+                "daily_log_return": np.add.reduceat(w_log_ret, starts),
+                "coverage": np.add.reduceat(weight_arr, starts),
+            }
+        )
+    else:
+        daily = pd.DataFrame({"date": [], "daily_log_return": [], "coverage": []})
 
     # Convert log return to simple return for reporting convenience
-    daily_returns: List[float] = []
-    for lr in daily["daily_log_return"].tolist():
-        daily_returns.append(math.exp(float(lr)) - 1.0)
-    daily["daily_return"] = pd.Series(daily_returns, index=daily.index, dtype="float64")
-
-    # Build index level using log returns
-    levels: List[float] = []
-    level = float(base_level)
-    for lr in daily["daily_log_return"].tolist():
-        level *= math.exp(float(lr))
-        levels.append(level)
+    daily_log_arr = daily["daily_log_return"].to_numpy(dtype=np.float64)
+    daily["daily_return"] = pd.Series(np.expm1(daily_log_arr), index=daily.index, dtype="float64")
 
-    daily["index_level"] = levels
+    # Build index level using log returns: compounding exp(lr) multiplies is
+    # equivalent to exponentiating the running sum of log returns.
+    daily["index_level"] = float(base_level) * np.exp(np.cumsum(daily_log_arr))
 
     return daily.loc[:, ["date", "index_level", "daily_return", "daily_log_return", "coverage"]].copy()
 
@@ -182,8 +184,10 @@ def write_index_level_exports(out: pd.DataFrame, exports_dir: str) -> None:
     json_path = out_dir / "rte100_index_level.json"
 
     df = _as_df(out).copy()
-    df.to_csv(csv_path, index=False)
-    df.to_json(json_path, orient="records", indent=2, date_format="iso")
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    write_csv(df, csv_path)
+    write_records_json(df, json_path)
 
     print(f"[index_engine] Index level CSV: {csv_path}")
     print(f"[index_engine] Index level JSON: {json_path}")
\ No newline at end of file
@@ -1,13 +1,19 @@
 # src/index_engine/pipeline.py
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
 from typing import Optional, cast, List
 
 import pandas as pd
+import pyarrow as pa
 
 from .parameters import EDRParams, RollingParams, RebalanceParams, StorageParams
-from .io_runs import load_pruned_file  # <- your loader: (path: Path) -> pd.DataFrame
+from .io_runs import load_pruned_file, write_csv, write_records_json  # <- your loader: (path: Path) -> pd.DataFrame
 from .edr_model import compute_edr_daily
 from .rolling_features import compute_rolling_features
 from .rebalance import rebalance_weekly
@@ -15,6 +21,12 @@ from .report import write_weekly_report
 from .index_level import build_index_level_series, write_index_level_exports
 
 
+# Copy-on-Write lets slices stay lazy until mutated (always on in pandas 3;
+# opt-in on the 2.x line this project pins).
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+
 def _as_df(obj: object) -> pd.DataFrame:
     if isinstance(obj, pd.DataFrame):
         return obj
@@ -44,16 +56,51 @@ def update_snapshots_from_runs(
     edr_params: EDRParams,
 ) -> pd.DataFrame:
     """
-    Reads all runs under runs_dir, computes per-day snapshots with EDR, and appends to snapshots.parquet.
-    Rebuild approach: load all files each run (simple + consistent).
+    Reads runs under runs_dir, computes per-day snapshots with EDR, and appends to snapshots.parquet.
+    Incremental: run days already present in the existing parquet are skipped,
+    so steady-state daily invocations only parse + score the new day.
     """
     runs_path = Path(runs_dir)
     pruned_files = _find_pruned_files(runs_path)
 
-    rows: list[pd.DataFrame] = []
-    for f in pruned_files:
+    out_dir = Path(storage.index_data_dir)
+    _ensure_dir(out_dir)
+    snap_path = out_dir / storage.snapshots_file
+
+    existing = _read_parquet_if_exists(snap_path)
+    seen: set[str] = set()
+    if not existing.empty and "snapshot_date" in existing.columns:
+        seen = set(existing["snapshot_date"].astype(str).unique())
+
+    pruned_files = [f for f in pruned_files if f.parent.parent.name not in seen]
+    if not pruned_files and not existing.empty:
+        return existing
+
+    # Sidecar cache: keyed by file content + EDR params, so re-running the
+    # pipeline (or backfilling with unchanged params) is one parquet read
+    # per day instead of JSON parse + the full EDR transform chain.
+    cache_dir = out_dir / ".edr_cache"
+    _ensure_dir(cache_dir)
+    params_key = repr(sorted(asdict(edr_params).items())).encode("utf-8")
+
+    def _load_and_compute(f: Path) -> pd.DataFrame:
+        raw = f.read_bytes()
         # Expect path like runs/2026-01-05/pruned/...json
         run_date = f.parent.parent.name  # YYYY-MM-DD
+        # The run date comes from the directory name, not the bytes, and is
+        # baked into the cached frame's snapshot_date — so it must be part
+        # of the key, or byte-identical files from different run days would
+        # collide and replay the wrong date.
+        digest = hashlib.sha1(raw + params_key + run_date.encode("utf-8")).hexdigest()
+        cache_path = cache_dir / (digest + ".parquet")
+        if cache_path.exists():
+            try:
+                return cast(pd.DataFrame, pd.read_parquet(cache_path))
+            except (OSError, pa.ArrowException):
+                # Truncated/corrupt entry: fall through and recompute; the
+                # rewrite below replaces it atomically.
+                pass
+
         df_day = load_pruned_file(f, run_date)
         df_day = _as_df(df_day).copy()
 
@@ -62,10 +109,27 @@ def update_snapshots_from_runs(
         # Compute EDR + derived columns
         df_day = compute_edr_daily(df_day, edr_params)
 
-        rows.append(df_day)
-
-    if rows:
-        snapshots = pd.concat(rows, ignore_index=True)
+        # Write-then-rename so concurrent workers and interrupted runs never
+        # leave a partially written file at the final path.
+        tmp_path = cache_path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+        df_day.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        return df_day
+
+    def _load_as_table(f: Path) -> pa.Table:
+        return pa.Table.from_pandas(_load_and_compute(f), preserve_index=False)
+
+    tables: list[pa.Table] = []
+    if pruned_files:
+        # JSON decode (orjson) releases the GIL, so a thread pool overlaps
+        # file reads and parsing across run days. map() preserves file order.
+        with ThreadPoolExecutor(max_workers=min(16, len(pruned_files))) as ex:
+            tables = list(ex.map(_load_as_table, pruned_files))
+
+    if tables:
+        # Arrow concat stitches column buffers (zero-copy where schemas
+        # match) versus pd.concat re-copying every block per day.
+        snapshots = pa.concat_tables(tables, promote_options="default").to_pandas()
     else:
         snapshots = pd.DataFrame()
 
@@ -73,11 +137,21 @@ def update_snapshots_from_runs(
     if not snapshots.empty and "snapshot_date" in snapshots.columns:
         snapshots["snapshot_date"] = pd.to_datetime(snapshots["snapshot_date"], errors="coerce").dt.date.astype(str)
 
-    out_dir = Path(storage.index_data_dir)
-    _ensure_dir(out_dir)
-
-    snap_path = out_dir / storage.snapshots_file
-    snapshots.to_parquet(snap_path, index=False)
+    if not existing.empty:
+        snapshots = pd.concat([existing, snapshots], ignore_index=True)
+        # Only re-sort when a backfilled day landed before the existing tail;
+        # the common append-only case keeps the stored order untouched.
+        dates = snapshots["snapshot_date"].astype(str)
+        if not dates.is_monotonic_increasing:
+            snapshots = snapshots.sort_values(by=["snapshot_date"], kind="stable", ignore_index=True)
+
+    # Downcast before writing (and return the same frame, so in-memory and
+    # reloaded-from-parquet runs see identical dtypes).
+    snapshots = _downcast(snapshots)
+
+    # Snappy + bounded row groups: cheap to decompress and lets readers
+    # skip row groups by snapshot_date statistics as the history grows.
+    snapshots.to_parquet(snap_path, index=False, compression="snappy", row_group_size=50_000)
     return snapshots
 
 def _series_dt_date(df: pd.DataFrame, col: str) -> pd.Series:
@@ -96,17 +170,63 @@ def rebuild_features(
 ) -> pd.DataFrame:
     """
     Recomputes rolling features from snapshots and writes features.parquet.
-    """
-    feats = compute_rolling_features(_as_df(snapshots), rolling_params)
 
+    When the stored features already cover every snapshot row (same max
+    date, same row count) and were built with the same RollingParams (a
+    sidecar records the params each build used), the recompute is skipped
+    and the stored frame is returned. A windowed incremental rebuild is
+    deliberately not attempted: the adjust=False EMAs depend on the full
+    per-universe history, so a truncated-context recompute would drift
+    from the full one.
+    """
     out_dir = Path(storage.index_data_dir)
     _ensure_dir(out_dir)
 
     feat_path = out_dir / storage.features_file
+    params_path = feat_path.with_name(feat_path.name + ".params")
+    params_sig = repr(sorted(asdict(rolling_params).items()))
+
+    snapshots = _as_df(snapshots)
+    existing = _read_parquet_if_exists(feat_path)
+    if (
+        not existing.empty
+        and not snapshots.empty
+        and "snapshot_date" in existing.columns
+        and len(existing) == len(snapshots)
+        and params_path.exists()
+        and params_path.read_text(encoding="utf-8") == params_sig
+    ):
+        have = pd.to_datetime(existing["snapshot_date"], errors="coerce").max()
+        want = pd.to_datetime(snapshots["snapshot_date"], errors="coerce").max()
+        if pd.notna(have) and have == want:
+            return existing
+
+    feats = compute_rolling_features(snapshots, rolling_params)
     _as_df(feats).to_parquet(feat_path, index=False)
+    params_path.write_text(params_sig, encoding="utf-8")
     return _as_df(feats)
 
 
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink storage dtypes before the parquet write: numerics down to the
+    smallest float/integer that holds them, repeated strings to category
+    (dictionary-encoded in parquet). Downstream consumers re-coerce to
+    float64 where it matters (_series_float), so derived quantities are
+    unaffected.
+    """
+    df = df.copy()
+    for c in df.columns:
+        dtype = df[c].dtype
+        if pd.api.types.is_float_dtype(dtype):
+            df[c] = pd.to_numeric(df[c], downcast="float")
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+        elif c in ("name", "developer"):
+            df[c] = df[c].astype("category")
+    return df
+
+
 def _read_parquet_if_exists(path: Path) -> pd.DataFrame:
     if path.exists():
         return cast(pd.DataFrame, pd.read_parquet(path))
@@ -155,19 +275,17 @@ def export_rebalance_outputs(
     latest_snap = pd.DataFrame({"universeId": []})
     if (not snapshots.empty) and ("universeId" in snapshots.columns) and ("snapshot_date" in snapshots.columns):
         snapshots = snapshots.copy()
-        snapshots["snapshot_date"] = _series_dt_date(snapshots, "snapshot_date").dt.date  # Series[date]
+        snapshots["snapshot_date"] = _series_dt_date(snapshots, "snapshot_date")  # Series[Timestamp]
 
-        asof = pd.to_datetime(reb_date_iso).date()
+        asof = pd.to_datetime(reb_date_iso)
         mask = cast(pd.Series, snapshots["snapshot_date"] <= asof)
-        snaps_asof = snapshots.loc[mask].copy()
+        snaps_asof = snapshots.loc[mask]
 
         if not snaps_asof.empty:
-            snaps_asof = snaps_asof.sort_values(by=["universeId", "snapshot_date"], kind="stable")
-            # groupby/tail can be typed weirdly; cast it back
-            latest_snap = cast(
-                pd.DataFrame,
-                snaps_asof.groupby("universeId", as_index=False).tail(1),
-            )
+            # idxmax picks the latest row per universe in one groupby scan,
+            # with no full-history sort.
+            idx = snaps_asof.groupby("universeId", sort=False)["snapshot_date"].idxmax()
+            latest_snap = cast(pd.DataFrame, snaps_asof.loc[idx].reset_index(drop=True))
 
     # --- merge membership + latest snapshot ---
     export_df = cast(
@@ -214,8 +332,8 @@ def export_rebalance_outputs(
     dated_csv = exports_day / "rte100.csv"
     dated_json = exports_day / "rte100.json"
 
-    export_df.to_csv(dated_csv, index=False)
-    export_df.to_json(dated_json, orient="records", indent=2)
+    write_csv(export_df, dated_csv)
+    write_records_json(export_df, dated_json)
 
     print(f"[index_engine] Exported: {dated_csv}")
     print(f"[index_engine] Exported: {dated_json}")
@@ -226,6 +344,7 @@ def run_weekly_rebalance(
     rebalance_date: str,
     storage: StorageParams,
     rebalance_params: RebalanceParams,
+    snapshots: Optional[pd.DataFrame] = None,
 ) -> None:
     """
     Runs rebalance for a specific date, writes membership.parquet, and writes exports:
@@ -263,8 +382,11 @@ def run_weekly_rebalance(
     membership_all.to_parquet(membership_path, index=False)
 
     # --- Export constituents: dated + latest ---
-    snapshots_path = out_dir / storage.snapshots_file
-    snapshots = _read_parquet_if_exists(snapshots_path)
+    # Reuse the caller's in-memory snapshots when provided; reloading the
+    # parquet would re-decompress the full history for nothing.
+    if snapshots is None:
+        snapshots_path = out_dir / storage.snapshots_file
+        snapshots = _read_parquet_if_exists(snapshots_path)
 
     export_df = export_rebalance_outputs(
     result_membership_obj=result.membership,
@@ -324,4 +446,5 @@ def run_pipeline(
             rebalance_date=reb_date_iso,
             storage=storage,
             rebalance_params=rebalance_params,
+            snapshots=snapshots,
         )
\ No newline at end of file
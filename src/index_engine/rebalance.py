@@ -1,11 +1,54 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, cast
+from typing import Optional, Tuple, cast
 
+import numpy as np
 import pandas as pd
 
 from .parameters import RebalanceParams
+from .rolling_features import _ensure_normalized_date
+
+
+def _rank_pct_columns(x: np.ndarray) -> np.ndarray:
+    """
+    Column-wise percentile ranks with average ties, matching
+    Series.rank(pct=True) per column of the (n, k) input.
+
+    All k columns go through one axis-0 argsort and a single tie-group
+    scan over the column-major flattened sorted values — no per-element
+    Python and no separate rank pass per column. NaN ranks stay NaN and
+    each column's percentiles divide by its own valid count.
+    """
+    n, k = x.shape
+    if n == 0:
+        return np.empty((0, k))
+    order = np.argsort(x, axis=0, kind="stable")
+    sv = np.take_along_axis(x, order, axis=0)
+
+    # Column-major flatten: each column is one contiguous segment, so one
+    # boundary scan covers every tie group in every column. NaNs sort to
+    # the end and never compare equal, so they form singleton groups that
+    # are masked out below.
+    flat = sv.ravel(order="F")
+    new_group = np.empty(n * k, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = flat[1:] != flat[:-1]
+    new_group[np.arange(1, k) * n] = True
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.append(starts, n * k))
+
+    # 1-based average rank of each tie group within its column.
+    avg = (starts % n) + (sizes + 1) / 2.0
+    ranks_sorted = np.repeat(avg, sizes).reshape((n, k), order="F")
+    ranks = np.empty((n, k))
+    np.put_along_axis(ranks, order, ranks_sorted, axis=0)
+
+    valid = ~np.isnan(x)
+    m = valid.sum(axis=0)
+    out = ranks / np.where(m > 0, m, 1)
+    out[~valid] = np.nan
+    return out
 
 @dataclass(frozen=True)
 class RebalanceResult:
@@ -13,7 +56,7 @@ class RebalanceResult:
     ranked: pd.DataFrame # -- ranked universe for debugging
 
 
-def _score_v1(latest: pd.DataFrame) -> pd.Series:
+def _score_v1(edr_7d: np.ndarray, edr_mom: np.ndarray, edr_14d_vol: np.ndarray) -> np.ndarray:
     """
     Minimal composite score for weekly selection:
 
@@ -21,59 +64,59 @@ def _score_v1(latest: pd.DataFrame) -> pd.Series:
     - momentum: edr_mom
     - risk penalty: edr_14d_vol
 
-    Score is cross-sectional z-like by rank percentiles
+    Score is cross-sectional z-like by rank percentiles. Pure ndarray
+    in/out — column lookup, bootstrap fallbacks and NaN patching are the
+    caller's job — so the kernel is just one batched rank and a blend.
     """
-    # Bootstrapping fallback: if 7d mean is missing, use today's edr_raw
-    edr_7d_missing = "edr_7d_mean" not in latest.columns
-    edr_7d_all_na = bool(latest["edr_7d_mean"].isna().all()) if not edr_7d_missing else True
-    if edr_7d_missing or edr_7d_all_na:
-        latest = latest.copy()
-        edr_raw_series = cast(pd.Series, latest["edr_raw"]) if "edr_raw" in latest.columns else pd.Series([0.0] * len(latest), dtype=float)
-        latest["edr_7d_mean"] = edr_raw_series
     # -- Higher is better: edr_7d_mean, edr_mom
     # -- Lower is better: edr_14d_vol
+    ranks = _rank_pct_columns(np.column_stack((edr_7d, edr_mom, edr_14d_vol)))
+    return ranks @ np.array([0.65, 0.25, -0.10])
 
-    n = len(latest)
-    idx = latest.index
 
-    # --- Level (revenue strength) ---
-    edr_7d = (
-        latest["edr_7d_mean"]
-        if "edr_7d_mean" in latest.columns
-        else pd.Series([pd.NA] * n, index=idx)
-    )
+def _score_inputs(latest: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract (edr_7d, edr_mom, edr_14d_vol) score inputs as float64 arrays.
 
+    compute_rolling_features already fills edr_7d_mean (same-row fallback)
+    and zero-fills edr_mom / edr_14d_vol, so the NaN patches below are
+    no-ops on the pipeline path; the cheap isnan probe keeps them from
+    running a fill pass regardless.
+    """
+    n = len(latest)
     edr_raw = (
-        latest["edr_raw"]
+        latest["edr_raw"].to_numpy(dtype=np.float64)
         if "edr_raw" in latest.columns
-        else pd.Series([0.0] * n, index=idx)
+        else np.zeros(n)
     )
 
-    level_series = edr_7d.fillna(edr_raw).astype(float)
-    level = level_series.rank(pct=True)
-
+    # Bootstrapping fallback: if the 7d mean is missing entirely, score on
+    # today's edr_raw.
+    if "edr_7d_mean" in latest.columns:
+        level = latest["edr_7d_mean"].to_numpy(dtype=np.float64)
+        nan_mask = np.isnan(level)
+        if nan_mask.all():
+            level = edr_raw
+        elif nan_mask.any():
+            level = np.where(nan_mask, edr_raw, level)
+    else:
+        level = edr_raw
 
-    # --- Momentum ---
     if "edr_mom" in latest.columns:
-        mom_series = latest["edr_mom"].astype(float)
+        mom = latest["edr_mom"].to_numpy(dtype=np.float64)
+        if np.isnan(mom).any():
+            mom = np.nan_to_num(mom, nan=0.0)
     else:
-        mom_series = pd.Series([0.0] * n, index=idx)
+        mom = np.zeros(n)
 
-    mom = mom_series.fillna(0.0).rank(pct=True)
-
-
-    # --- Risk (volatility penalty) ---
     if "edr_14d_vol" in latest.columns:
-        risk_series = latest["edr_14d_vol"].astype(float)
+        risk = latest["edr_14d_vol"].to_numpy(dtype=np.float64)
+        if np.isnan(risk).any():
+            risk = np.nan_to_num(risk, nan=0.0)
     else:
-        risk_series = pd.Series([0.0] * n, index=idx)
-
-    risk = risk_series.fillna(0.0).rank(pct=True)
+        risk = np.zeros(n)
 
-
-    # --- Final composite score ---
-    score = 0.65 * level + 0.25 * mom - 0.10 * risk
-    return score
+    return level, mom, risk
 
 def rebalance_weekly(features: pd.DataFrame, rebalance_date: str, params: RebalanceParams, prior_membership: Optional[pd.DataFrame] = None,) -> RebalanceResult:
     """
@@ -85,13 +128,44 @@ def rebalance_weekly(features: pd.DataFrame, rebalance_date: str, params: Rebala
 
     reb_date = pd.to_datetime(rebalance_date).normalize()
 
-    # -- Use latest available row per universeId up to rebalance_date
-    df = features.copy()
-    df["snapshot_date"] = pd.to_datetime(df["snapshot_date"]).dt.normalize()
-    df = cast(pd.DataFrame, df[df["snapshot_date"] <= reb_date])
-
-    sorted_df = cast(pd.DataFrame, df.sort_values(by=["universeId", "snapshot_date"]))
-    latest = cast(pd.DataFrame, sorted_df.groupby("universeId", as_index=False).tail(1))
+    # -- Use latest available row per universeId up to rebalance_date.
+    # Narrow to the columns scoring and reporting read before any sorting;
+    # the rest of the feature frame never leaves this line.
+    needed = [
+        "universeId", "snapshot_date", "edr_raw",
+        "edr_7d_mean", "edr_mom", "edr_14d_vol", "coverage_7d",
+    ]
+    df = features.loc[:, [c for c in needed if c in features.columns]].copy()
+    df["snapshot_date"] = _ensure_normalized_date(df["snapshot_date"])
+
+    # When dates arrive sorted the as-of cut is a binary search plus a
+    # positional slice (a view), instead of a full boolean mask and take.
+    dates = df["snapshot_date"].to_numpy()
+    if len(dates) > 0 and bool(np.all(dates[1:] >= dates[:-1])):
+        cutoff = np.datetime64(reb_date).astype(dates.dtype)
+        df = cast(pd.DataFrame, df.iloc[: int(np.searchsorted(dates, cutoff, side="right"))])
+    else:
+        df = cast(pd.DataFrame, df[df["snapshot_date"] <= reb_date])
+
+    # compute_rolling_features returns its frame sorted by (universeId,
+    # snapshot_date), and filtering preserves that order. When the probe
+    # confirms it, each universe's last occurrence already is its latest
+    # row and drop_duplicates needs no sort at all; otherwise one stable
+    # sort on the date restores the keep="last" semantics.
+    try:
+        u = df["universeId"].to_numpy(dtype="float64", na_value=np.nan)
+        d = df["snapshot_date"].to_numpy()
+        same_u = u[1:] == u[:-1]
+        pair_sorted = (
+            len(u) > 0
+            and bool(np.all(u[1:] >= u[:-1]))
+            and bool(np.all(d[1:][same_u] >= d[:-1][same_u]))
+        )
+    except (TypeError, ValueError):
+        # Non-numeric ids: probe inconclusive, take the sorting path.
+        pair_sorted = False
+    sorted_df = df if pair_sorted else cast(pd.DataFrame, df.sort_values(by="snapshot_date", kind="stable"))
+    latest = cast(pd.DataFrame, sorted_df.drop_duplicates(subset="universeId", keep="last"))
 
     # -- Eligibility
 
@@ -101,44 +175,58 @@ def rebalance_weekly(features: pd.DataFrame, rebalance_date: str, params: Rebala
         return RebalanceResult(membership=membership, ranked=latest)
 
     # -- Score & Rank
-    latest["score"] = _score_v1(latest)
+    latest["score"] = _score_v1(*_score_inputs(latest))
     latest = cast(pd.DataFrame, latest.sort_values("score", ascending=False).reset_index(drop=True))
     latest["rank"] = latest.index + 1
 
-    # -- Determine current members using hysteresis
-    prev_set = set()
+    # -- Determine current members using hysteresis. Pure array masks over
+    # the prior membership: no frame copy, no .query() expression parse,
+    # no intermediate Python set.
+    prev_ids = np.empty(0, dtype=object)
     if prior_membership is not None and not prior_membership.empty:
-        pm = prior_membership.copy()
-        pm["rebalance_date"] = pd.to_datetime(pm["rebalance_date"]).dt.normalize()
-        last_reb = pm["rebalance_date"].max()
-        prev_set = set(pm.loc[pm["rebalance_date"] == last_reb].query("in_index == True")["universeId"].tolist())
-
-    
-    # -- Base selection by rank
-    enter = set(latest.loc[latest["rank"] <= params.enter_rank, "universeId"].tolist())
-    stay = set(latest.loc[latest["rank"] <= params.exit_rank, "universeId"].tolist())
+        reb = _ensure_normalized_date(prior_membership["rebalance_date"]).to_numpy()
+        valid_reb = ~np.isnat(reb)
+        if valid_reb.any():
+            mask = reb == reb[valid_reb].max()
+            if "in_index" in prior_membership.columns:
+                mask &= prior_membership["in_index"].to_numpy(dtype=bool)
+            prev_ids = prior_membership["universeId"].to_numpy()[mask]
+
+
+    # -- Base selection by rank, as boolean masks over the rank-ordered
+    # frame (latest is sorted by score, so rank == position + 1 and the
+    # "best remaining" rows are simply the first unselected positions).
+    rank_arr = latest["rank"].to_numpy()
+    prev_mask = latest["universeId"].isin(prev_ids).to_numpy()
+
+    # Hysteresis: anyone inside enter_rank comes in; existing members
+    # survive down to exit_rank.
+    in_index = (rank_arr <= params.enter_rank) | (
+        (rank_arr <= params.exit_rank) & prev_mask
+    )
 
-    selected = list(enter | stay)
+    # -- Fill/trim to exactly n_constituents by next best ranks
+    n_selected = int(in_index.sum())
+    if n_selected < params.n_constituents:
+        fill = np.flatnonzero(~in_index)[: params.n_constituents - n_selected]
+        in_index[fill] = True
+    elif n_selected > params.n_constituents:
+        keep = np.flatnonzero(in_index)[: params.n_constituents]
+        in_index = np.zeros(len(latest), dtype=bool)
+        in_index[keep] = True
 
-    # -- Fill to exactly n_constituents with next best ranks
-    if len(selected) < params.n_constituents:
-        fill = latest.loc[~latest["universeId"].isin(selected)].head(params.n_constituents - len(selected))["universeId"].tolist()
-        selected.extend(fill)
-    else:
-        selected = latest.loc[latest["universeId"].isin(selected)].head(params.n_constituents)["universeId"].tolist()
-    
     # -- Build membership frame
-    latest["in_index"] = latest["universeId"].isin(selected)
+    latest["in_index"] = in_index
     members = latest[latest["in_index"]].copy()
 
     # -- Simple weights: revenue-level proxy weights by edr_7d_mean
 
-    edr_series = cast(pd.Series, members["edr_7d_mean"])
-    denom = edr_series.clip(lower=0.0).sum()
-    if denom > 0:
-        members["weight"] = edr_series.clip(lower=0.0) / denom
-    else:
-        members["weight"] = 1.0 / len(members)
+    # Clip once into an array; the old code clipped the Series twice (once
+    # for the denominator, once for the division).
+    edr_arr = members["edr_7d_mean"].to_numpy(dtype=np.float64)
+    w = np.where(np.isnan(edr_arr), 0.0, np.maximum(edr_arr, 0.0))
+    denom = float(w.sum())
+    members["weight"] = w / denom if denom > 0 else 1.0 / len(members)
     
     membership = cast(pd.DataFrame, members[["universeId", "rank", "in_index", "weight"]].copy())
     membership.insert(0, "rebalance_date", reb_date.date())
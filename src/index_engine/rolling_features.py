@@ -1,9 +1,36 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from ._rolling_kernels import (
+    cumulative_sums,
+    group_start_per_row,
+    grouped_ewma,
+    rolling_count,
+    rolling_stats,
+    window_bounds,
+)
 from .parameters import RollingParams
 
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def _ensure_normalized_date(s: pd.Series) -> pd.Series:
+    """
+    Midnight-normalized datetime64 view of s, skipping the parse/normalize
+    passes when the column already satisfies them (the common case once
+    dates have been through one pipeline stage).
+    """
+    if pd.api.types.is_datetime64_any_dtype(s):
+        ns = s.to_numpy(dtype="datetime64[ns]").view("int64")
+        nat = ns == np.iinfo(np.int64).min
+        if bool(((ns % _NS_PER_DAY == 0) | nat).all()):
+            return s
+        return s.dt.normalize()
+    return pd.to_datetime(s).dt.normalize()
+
+
 def compute_rolling_features(history: pd.DataFrame, params: RollingParams) -> pd.DataFrame:
     """
     history: time-series snapshots containing at minimum:
@@ -13,33 +40,75 @@ def compute_rolling_features(history: pd.DataFrame, params: RollingParams) -> pd
     edr_7d_mean, edr_ema7, edr_ema30, edr_mom, edr_14_vol
     ccu_7d_mean
     coverage_7d
-    """
 
-    df = history.copy()
-    df["snapshot_date"] = pd.to_datetime(df["snapshot_date"])
-    df = df.sort_values(["universeId", "snapshot_date"])
+    The result is sorted by (universeId, snapshot_date) — the layout the
+    kernels run on is the layout returned. Downstream consumers
+    (rebalance_weekly) rely on this to skip re-sorting.
+    """
 
-    g = df.groupby("universeId", group_keys=False)
+    # Only these columns feed the rolling computation; anything else in the
+    # snapshot panel would just be dragged through the sort and every
+    # feature assignment below.
+    df = history.loc[:, ["universeId", "snapshot_date", "edr_raw", "avg_ccu"]].copy()
+    df["snapshot_date"] = _ensure_normalized_date(df["snapshot_date"])
 
-    # -- Coverage
-    df["coverage_7d"] = g["edr_raw"].transform(lambda s: s.rolling(7, min_periods=1).count() / 7.0)
+    # Factorize the (nullable Int64) key to dense int codes once: the sort
+    # and the kernel group boundaries then run on plain int64 instead of
+    # boxed/masked comparisons. sort=True keeps the ordering identical to
+    # sorting on the raw key.
+    codes, _ = pd.factorize(df["universeId"], sort=True)
+    order = np.lexsort((df["snapshot_date"].to_numpy(dtype="datetime64[ns]"), codes))
+    df = df.take(order)
+    codes = codes[order]
 
-    # -- Rolling Means
-    df["edr_7d_mean"] = g["edr_raw"].transform(lambda s: s.rolling(7, min_periods=params.mean_7d_min_periods).mean())
-    df["ccu_7d_mean"] = g["avg_ccu"].transform(lambda s: s.rolling(7, min_periods=params.mean_7d_min_periods).mean())
+    # Fused window kernels: the sorted layout means each group is one
+    # contiguous stretch, so every rolling statistic comes from a single
+    # cumulative-sum sweep clamped at group starts (no per-group dispatch,
+    # no separate pass per statistic).
+    starts = group_start_per_row(codes)
+    edr = df["edr_raw"].to_numpy(dtype=np.float64)
+    ccu = df["avg_ccu"].to_numpy(dtype=np.float64)
 
-    # -- Rolling means fallback
-    df["edr_7d_mean"] = df["edr_7d_mean"].fillna(df["edr_raw"])
-    df["ccu_7d_mean"] = df["ccu_7d_mean"].fillna(df["avg_ccu"])
+    # The window plan is shared: one set of prefix sums per column, one
+    # bounds array per window size, reused by every statistic below.
+    edr_cums = cumulative_sums(edr)
+    lo7 = window_bounds(len(edr), starts, 7)
+    lo14 = window_bounds(len(edr), starts, 14)
 
-    # -- EMAs and momentum
-    df["edr_ema7"] = g["edr_raw"].transform(lambda s: s.ewm(span=params.ema_fast, adjust=False).mean())
-    df["edr_ema30"] = g["edr_raw"].transform(lambda s: s.ewm(span=params.ema_slow, adjust=False).mean())
-    df["edr_mom"] = (df["edr_ema7"] / df["edr_ema30"].replace({0: pd.NA})).fillna(0.0)
+    edr_mean7, _, _ = rolling_stats(edr, starts, 7, params.mean_7d_min_periods, cums=edr_cums, lo=lo7)
+    ccu_mean7, _, _ = rolling_stats(ccu, starts, 7, params.mean_7d_min_periods, lo=lo7)
+    mean14, _, std14 = rolling_stats(edr, starts, 14, 2, cums=edr_cums, lo=lo14)
 
-    # -- 14d volatility
-    rolling_std = g["edr_raw"].transform(lambda s: s.rolling(14, min_periods=2).std())
-    rolling_mean = g["edr_raw"].transform(lambda s: s.rolling(14, min_periods=2).mean())
-    df["edr_14d_vol"] = (rolling_std / rolling_mean.replace({0: pd.NA})).fillna(0.0)
+    # -- EMAs and momentum: both spans fall out of one time-stepped sweep
+    # over the same group layout the window kernels use.
+    ema_fast, ema_slow = grouped_ewma(
+        edr, starts, 2.0 / (params.ema_fast + 1.0), 2.0 / (params.ema_slow + 1.0)
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mom = ema_fast / np.where(ema_slow == 0.0, np.nan, ema_slow)
+        # -- 14d volatility
+        vol = std14 / np.where(mean14 == 0.0, np.nan, mean14)
 
-    return df
\ No newline at end of file
+    # One frame construction from finished arrays: seven separate column
+    # assignments would each go through the setitem/alignment path on a
+    # frame that only grows.
+    return pd.DataFrame(
+        {
+            "universeId": df["universeId"].array,
+            "snapshot_date": df["snapshot_date"].array,
+            "edr_raw": df["edr_raw"].array,
+            "avg_ccu": df["avg_ccu"].array,
+            # Coverage: just the window count (min_periods=1 semantics),
+            # read straight off the prefix counts.
+            "coverage_7d": rolling_count(edr_cums, lo7) / 7.0,
+            # Rolling means, with same-row fallback where the window is
+            # short of min_periods.
+            "edr_7d_mean": np.where(np.isnan(edr_mean7), edr, edr_mean7),
+            "ccu_7d_mean": np.where(np.isnan(ccu_mean7), ccu, ccu_mean7),
+            "edr_ema7": ema_fast,
+            "edr_ema30": ema_slow,
+            "edr_mom": np.where(np.isnan(mom), 0.0, mom),
+            "edr_14d_vol": np.where(np.isnan(vol), 0.0, vol),
+        },
+        copy=False,
+    )
\ No newline at end of file
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from .parameters import RollingParams
+
+try:
+    import polars as pl
+except ImportError:  # polars is an optional accelerator, not a dependency
+    pl = None  # type: ignore[assignment]
+
+
+def compute_rolling_features_pl(history: pd.DataFrame, params: RollingParams) -> pd.DataFrame:
+    """
+    Polars port of compute_rolling_features: same input contract, same
+    output columns, same window/EMA semantics (min_samples thresholds,
+    ddof=1 std, adjust=False EMAs that weight across null gaps).
+
+    Opt-in: polars is not one of this project's dependencies. Callers
+    that have it installed can swap this in for the NumPy-kernel path;
+    importing this module without polars is fine, calling it is not.
+    """
+    if pl is None:
+        raise ImportError(
+            "polars is not installed; install it or use "
+            "rolling_features.compute_rolling_features"
+        )
+
+    lf = (
+        pl.from_pandas(history.loc[:, ["universeId", "snapshot_date", "edr_raw", "avg_ccu"]])
+        .lazy()
+        .with_columns(pl.col("snapshot_date").cast(pl.Datetime("ns")).dt.truncate("1d"))
+        .sort(["universeId", "snapshot_date"])
+    )
+
+    over = {"partition_by": "universeId"}
+    edr = pl.col("edr_raw")
+    ccu = pl.col("avg_ccu")
+
+    lf = lf.with_columns(
+        (edr.is_not_null().cast(pl.Float64).rolling_sum(window_size=7, min_samples=1).over(**over) / 7.0).alias("coverage_7d"),
+        edr.rolling_mean(window_size=7, min_samples=params.mean_7d_min_periods).over(**over).fill_null(edr).alias("edr_7d_mean"),
+        ccu.rolling_mean(window_size=7, min_samples=params.mean_7d_min_periods).over(**over).fill_null(ccu).alias("ccu_7d_mean"),
+        edr.ewm_mean(span=params.ema_fast, adjust=False, ignore_nulls=False).over(**over).alias("edr_ema7"),
+        edr.ewm_mean(span=params.ema_slow, adjust=False, ignore_nulls=False).over(**over).alias("edr_ema30"),
+        edr.rolling_mean(window_size=14, min_samples=2).over(**over).alias("_mean14"),
+        edr.rolling_std(window_size=14, min_samples=2, ddof=1).over(**over).alias("_std14"),
+    ).with_columns(
+        (pl.col("edr_ema7") / pl.col("edr_ema30").replace(0.0, None)).fill_null(0.0).fill_nan(0.0).alias("edr_mom"),
+        (pl.col("_std14") / pl.col("_mean14").replace(0.0, None)).fill_null(0.0).fill_nan(0.0).alias("edr_14d_vol"),
+    ).drop(["_mean14", "_std14"])
+
+    return lf.collect().to_pandas()